@@ -1,9 +1,19 @@
 
+import asyncio
+import contextlib
+import functools
+import hashlib
+import multiprocessing
 import os
+import stat
+import threading
 import uuid
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Tuple
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
@@ -13,11 +23,34 @@ BASE = os.path.dirname(__file__)
 UPLOAD_DIR = os.path.join(BASE, "uploads")
 OUT_DIR = os.path.join(BASE, "output")
 FRONTEND_DIR = os.path.abspath(os.path.join(BASE, "..", "frontend"))
+# Results of idempotent operations, keyed by input content hash + parameters. It lives on
+# the same filesystem as OUT_DIR so entries can be hardlinked; the file routes refuse
+# dot-prefixed path segments, so it is never served directly.
+CACHE_DIR = os.path.join(OUT_DIR, ".cache")
+# Bump whenever a cached operation's output changes, so stale entries stop matching
+CACHE_VERSION = 2
+
+UPLOAD_CHUNK = 1 << 20  # 1 MiB
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUT_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# GIL-bound work (pdfminer, pdf2docx, Pillow/pikepdf recompression) runs in worker
+# processes so concurrent requests can use every core. "spawn" avoids forking a
+# process that already has server threads running.
+def _new_cpu_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+CPU_POOL = _new_cpu_pool()
+_CPU_POOL_LOCK = threading.Lock()
+
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    CPU_POOL.shutdown(wait=False, cancel_futures=True)
 
-app = FastAPI(title="UnlimitedPDFSuite v3")
+app = FastAPI(title="UnlimitedPDFSuite v3", lifespan=lifespan)
 
 # Serve the frontend
 app.mount("/assets", StaticFiles(directory=os.path.join(FRONTEND_DIR, "assets")), name="assets")
@@ -29,102 +62,151 @@ def index():
 
 # Serve generated files
 
+def _file_response(file_path: str, mime: str) -> FileResponse:
+    """FileResponse from a single stat(): 404s on missing files; Starlette serves Range requests via sendfile."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not stat.S_ISREG(st.st_mode):
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(file_path, media_type=mime, filename=os.path.basename(file_path),
+                        stat_result=st, headers={"Accept-Ranges": "bytes"})
+
+def _reject_hidden(*parts: str) -> None:
+    """404 for dot-prefixed path segments (the result cache, "..")."""
+    if any(part.startswith(".") for part in parts):
+        raise HTTPException(status_code=404, detail="File not found")
+
 @app.get("/output/{path:path}")
 def serve_output(path: str):
     # Normalize and ensure the requested path stays within OUT_DIR
     requested = os.path.normpath(os.path.join(OUT_DIR, path))
     if not requested.startswith(os.path.abspath(OUT_DIR) + os.sep) and requested != os.path.abspath(OUT_DIR):
         raise HTTPException(status_code=400, detail="Invalid path")
-    if not os.path.exists(requested):
-        raise HTTPException(status_code=404, detail="File not found")
+    _reject_hidden(*os.path.relpath(requested, OUT_DIR).split(os.sep))
     filename = os.path.basename(requested)
     mime = "application/octet-stream"
     if filename.lower().endswith(".pdf"):
         mime = "application/pdf"
     elif filename.lower().endswith(".txt"):
         mime = "text/plain"
-    return FileResponse(requested, media_type=mime, filename=filename)
+    return _file_response(requested, mime)
 
 
 @app.get("/images/{dirname}/{filename}")
 def serve_image(dirname: str, filename: str):
+    _reject_hidden(dirname, filename)
     file_path = os.path.join(OUT_DIR, dirname, filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="File not found")
     if filename.lower().endswith(".png"):
         mime = "image/png"
     elif filename.lower().endswith((".jpg",".jpeg")):
         mime = "image/jpeg"
     else:
         mime = "application/octet-stream"
-    return FileResponse(file_path, media_type=mime, filename=filename)
+    return _file_response(file_path, mime)
+
+def _copy_upload(src, path: str, digest) -> None:
+    with open(path, "wb") as f:
+        while chunk := src.read(UPLOAD_CHUNK):
+            digest.update(chunk)
+            f.write(chunk)
 
-def _save_upload(u: UploadFile) -> str:
+async def _save_upload_hashed(u: UploadFile) -> Tuple[str, str]:
+    """Stream an upload to disk in fixed-size chunks, hashing it on the way. Returns (path, hex digest)."""
     ext = os.path.splitext(u.filename or "")[1].lower()
     name = f"{uuid.uuid4().hex}{ext or ''}"
     path = os.path.join(UPLOAD_DIR, name)
-    data = u.file.read()
-    with open(path, "wb") as f:
-        f.write(data)
+    digest = hashlib.blake2b(digest_size=20)
+    await run_in_threadpool(_copy_upload, u.file, path, digest)
+    return path, digest.hexdigest()
+
+async def _save_upload(u: UploadFile) -> str:
+    """Stream an upload to disk in fixed-size chunks (never holds the whole file in RAM)."""
+    path, _ = await _save_upload_hashed(u)
     return path
 
+def _cache_path(op: str, inputs: List[str], **params) -> str:
+    key = hashlib.blake2b(repr((CACHE_VERSION, op, inputs, sorted(params.items()))).encode(), digest_size=20).hexdigest()
+    return os.path.join(CACHE_DIR, f"{op}_{key}.pdf")
+
+def _link_cached(cached: str, out_path: str) -> bool:
+    """Hardlink a cached result to out_path; False on a miss or if linking fails (e.g. EMLINK)."""
+    try:
+        os.link(cached, out_path)
+        return True
+    except OSError:
+        return False
+
+def _store_cached(out_path: str, cached: str):
+    try:
+        os.link(out_path, cached)
+    except OSError:
+        pass  # already stored by a concurrent request
+
+@contextlib.contextmanager
+def _cpu_pool():
+    """
+    Yield the worker pool. If a worker dies while it is in use (OOM kill, native crash),
+    the broken pool is swapped for a fresh one so only the current request fails.
+    """
+    global CPU_POOL
+    pool = CPU_POOL
+    try:
+        yield pool
+    except BrokenProcessPool:
+        with _CPU_POOL_LOCK:
+            if CPU_POOL is pool:
+                CPU_POOL = _new_cpu_pool()
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+
+async def _run_in_process(func, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    with _cpu_pool() as pool:
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
 def _outpath(name: str) -> str:
     return os.path.join(OUT_DIR, name)
 
 # ---- API Endpoints ----
 
 @app.post("/api/convert/to-pdf")
-def api_convert_to_pdf(files: List[UploadFile] = File(...)):
-    in_files = [_save_upload(u) for u in files]
+async def api_convert_to_pdf(files: List[UploadFile] = File(...)):
+    uploads = [await _save_upload_hashed(u) for u in files]
+    in_files = [p for p, _ in uploads]
     out_path = _outpath(f"converted_{uuid.uuid4().hex}.pdf")
-    doc_files, img_files = [], []
-    for p in in_files:
-        ext = os.path.splitext(p)[1].lower()
-        if ext in [".jpg",".jpeg",".png",".gif",".tiff",".bmp",".webp"]:
-            img_files.append(p)
-        else:
-            doc_files.append(p)
-    temp_pdfs = []
+    # The extension picks the converter, so it is part of the key
+    cached = _cache_path("convert", [d + os.path.splitext(p)[1] for p, d in uploads])
     try:
-        for p in doc_files:
-            ext = os.path.splitext(p)[1].lower()
-            tmp = _outpath(f"tmp_{uuid.uuid4().hex}.pdf")
-            if ext == ".txt":
-                pdf_ops.txt_to_pdf(p, tmp)
-            else:
-                pdf_ops.office_to_pdf(p, tmp)
-            temp_pdfs.append(tmp)
-        if img_files:
-            img_pdf = _outpath(f"tmp_img_{uuid.uuid4().hex}.pdf")
-            pdf_ops.images_to_pdf(img_files, img_pdf)
-            temp_pdfs.append(img_pdf)
-        if not temp_pdfs:
-            raise HTTPException(status_code=400, detail="No convertible files provided.")
-        pdf_ops.merge_pdfs(temp_pdfs, out_path)
+        if not _link_cached(cached, out_path):
+            # The CPU slot only covers the rendering/merge step; queued LibreOffice runs don't hold a slot
+            await pdf_ops.convert_to_pdf(in_files, out_path, cpu_limit=pdf_ops.cpu_semaphore())
+            _store_cached(out_path, cached)
         return {"file": f"/output/{os.path.basename(out_path)}"}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Conversion failed: {e}")
-    finally:
-        for t in temp_pdfs:
-            try: os.remove(t)
-            except: pass
 
 @app.post("/api/convert/from-pdf")
-def api_convert_from_pdf(file: UploadFile = File(...),
-                         to: str = Form(...),
-                         dpi: int = Form(200),
-                         fmt: str = Form("png")):
-    in_path = _save_upload(file)
+async def api_convert_from_pdf(file: UploadFile = File(...),
+                               to: str = Form(...),
+                               dpi: int = Form(200),
+                               fmt: str = Form("png")):
+    in_path = await _save_upload(file)
     try:
         if to == "images":
             out_dir_name = f"images_{uuid.uuid4().hex}"
             out_dir = os.path.join(OUT_DIR, out_dir_name)
-            files = pdf_ops.pdf_to_images(in_path, out_dir, dpi=dpi, fmt=fmt)
+            # pdf_to_images runs one pdftoppm per core, so it takes a CPU slot like OCR/compress
+            async with pdf_ops.cpu_semaphore():
+                files = await run_in_threadpool(pdf_ops.pdf_to_images, in_path, out_dir, dpi=dpi, fmt=fmt)
             served = [f"/images/{out_dir_name}/{os.path.basename(f)}" for f in files]
             return {"files": served}
         elif to == "text":
             out_path = _outpath(f"text_{uuid.uuid4().hex}.txt")
-            pdf_ops.extract_text(in_path, out_path)
+            await _run_in_process(pdf_ops.extract_text, in_path, out_path)
             return {"file": f"/output/{os.path.basename(out_path)}"}
         else:
             raise HTTPException(status_code=400, detail="Unsupported 'to' value")
@@ -132,126 +214,134 @@ def api_convert_from_pdf(file: UploadFile = File(...),
         raise HTTPException(status_code=500, detail=f"Conversion failed: {e}")
 
 @app.post("/api/ocr")
-def api_ocr(file: UploadFile = File(...), lang: str = Form("eng")):
-    in_path = _save_upload(file)
+async def api_ocr(file: UploadFile = File(...), lang: str = Form("eng"), engine: str = Form("tesseract")):
+    in_path, digest = await _save_upload_hashed(file)
     out_path = _outpath(f"ocr_{uuid.uuid4().hex}.pdf")
+    cached = _cache_path("ocr", [digest], lang=lang, engine=engine)
     try:
-        pdf_ops.ocr_pdf(in_path, out_path, lang=lang)
+        if not _link_cached(cached, out_path):
+            async with pdf_ops.cpu_semaphore():
+                await pdf_ops.ocr_pdf(in_path, out_path, lang=lang, engine=engine)
+            _store_cached(out_path, cached)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OCR failed: {e}")
 
 @app.post("/api/compress")
-def api_compress(file: UploadFile = File(...), dpi: int = Form(150), grayscale: bool = Form(False)):
-    in_path = _save_upload(file)
+async def api_compress(file: UploadFile = File(...), dpi: int = Form(150), grayscale: bool = Form(False)):
+    in_path, digest = await _save_upload_hashed(file)
     out_path = _outpath(f"compressed_{uuid.uuid4().hex}.pdf")
+    cached = _cache_path("compress", [digest], dpi=dpi, grayscale=grayscale)
     try:
-        pdf_ops.compress_pdf(in_path, out_path, dpi=dpi, grayscale=grayscale)
+        if not _link_cached(cached, out_path):
+            async with pdf_ops.cpu_semaphore():
+                await _run_in_process(pdf_ops.compress_pdf, in_path, out_path, dpi=dpi, grayscale=grayscale)
+            _store_cached(out_path, cached)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Compression failed: {e}")
 
 @app.post("/api/merge")
-def api_merge(files: List[UploadFile] = File(...)):
-    in_paths = [_save_upload(u) for u in files]
+async def api_merge(files: List[UploadFile] = File(...)):
+    in_paths = [await _save_upload(u) for u in files]
     out_path = _outpath(f"merged_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.merge_pdfs(in_paths, out_path)
+        await run_in_threadpool(pdf_ops.merge_pdfs, in_paths, out_path)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Merge failed: {e}")
 
 @app.post("/api/merge/alternating")
-def api_merge_alternating(file_a: UploadFile = File(...), file_b: UploadFile = File(...)):
-    a = _save_upload(file_a)
-    b = _save_upload(file_b)
+async def api_merge_alternating(file_a: UploadFile = File(...), file_b: UploadFile = File(...)):
+    a = await _save_upload(file_a)
+    b = await _save_upload(file_b)
     out_path = _outpath(f"altmerge_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.merge_alternating(a, b, out_path)
+        await run_in_threadpool(pdf_ops.merge_alternating, a, b, out_path)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Alternating merge failed: {e}")
 
 @app.post("/api/split")
-def api_split(file: UploadFile = File(...), ranges: str = Form(...)):
-    in_path = _save_upload(file)
+async def api_split(file: UploadFile = File(...), ranges: str = Form(...)):
+    in_path = await _save_upload(file)
     out_dir = os.path.join(OUT_DIR, f"split_{uuid.uuid4().hex}")
     try:
-        files = pdf_ops.split_pdf(in_path, out_dir, ranges)
-        served = [f\"/output/{os.path.relpath(f, OUT_DIR)}\" for f in files]
+        files = await run_in_threadpool(pdf_ops.split_pdf, in_path, out_dir, ranges)
+        served = [f"/output/{os.path.relpath(f, OUT_DIR)}" for f in files]
         return {"files": served}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Split failed: {e}")
 
 @app.post("/api/rotate")
-def api_rotate(file: UploadFile = File(...), rotation: int = Form(90)):
-    in_path = _save_upload(file)
+async def api_rotate(file: UploadFile = File(...), rotation: int = Form(90)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"rotated_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.rotate_pdf(in_path, out_path, rotation)
+        await run_in_threadpool(pdf_ops.rotate_pdf, in_path, out_path, rotation)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Rotate failed: {e}")
 
 @app.post("/api/reorder")
-def api_reorder(file: UploadFile = File(...), order: str = Form(...)):
-    in_path = _save_upload(file)
+async def api_reorder(file: UploadFile = File(...), order: str = Form(...)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"reordered_{uuid.uuid4().hex}.pdf")
     try:
         order_list = [int(i.strip()) for i in order.split(",") if i.strip()]
-        pdf_ops.reorder_pdf(in_path, out_path, order_list)
+        await run_in_threadpool(pdf_ops.reorder_pdf, in_path, out_path, order_list)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Reorder failed: {e}")
 
 @app.post("/api/delete-pages")
-def api_delete_pages(file: UploadFile = File(...), indices: str = Form(...)):
-    in_path = _save_upload(file)
+async def api_delete_pages(file: UploadFile = File(...), indices: str = Form(...)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"deleted_{uuid.uuid4().hex}.pdf")
     try:
         idx = [int(i.strip()) for i in indices.split(",") if i.strip()]
-        pdf_ops.delete_pages(in_path, out_path, idx)
+        await run_in_threadpool(pdf_ops.delete_pages, in_path, out_path, idx)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete pages failed: {e}")
 
 @app.post("/api/layout/nup")
-def api_nup(file: UploadFile = File(...), cols: int = Form(2), rows: int = Form(2), margin_mm: float = Form(5.0)):
-    in_path = _save_upload(file)
+async def api_nup(file: UploadFile = File(...), cols: int = Form(2), rows: int = Form(2), margin_mm: float = Form(5.0)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"nup_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.n_up_pdf(in_path, out_path, cols=cols, rows=rows, margin_mm=margin_mm)
+        await run_in_threadpool(pdf_ops.n_up_pdf, in_path, out_path, cols=cols, rows=rows, margin_mm=margin_mm)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"N-up layout failed: {e}")
 
 @app.post("/api/layout/booklet")
-def api_booklet(file: UploadFile = File(...), margin_mm: float = Form(5.0)):
-    in_path = _save_upload(file)
+async def api_booklet(file: UploadFile = File(...), margin_mm: float = Form(5.0)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"booklet_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.booklet_impose(in_path, out_path, margin_mm=margin_mm)
+        await run_in_threadpool(pdf_ops.booklet_impose, in_path, out_path, margin_mm=margin_mm)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Booklet layout failed: {e}")
 
 @app.post("/api/password/set")
-def api_set_password(file: UploadFile = File(...), user_pass: str = Form(""), owner_pass: str = Form(""),
-                     allow_printing: bool = Form(True), allow_copy: bool = Form(True), allow_modify: bool = Form(True)):
-    in_path = _save_upload(file)
+async def api_set_password(file: UploadFile = File(...), user_pass: str = Form(""), owner_pass: str = Form(""),
+                           allow_printing: bool = Form(True), allow_copy: bool = Form(True), allow_modify: bool = Form(True)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"protected_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.set_password(in_path, out_path, user_pass, owner_pass or None, allow_printing, allow_copy, allow_modify)
+        await run_in_threadpool(pdf_ops.set_password, in_path, out_path, user_pass, owner_pass or None, allow_printing, allow_copy, allow_modify)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Password protection failed: {e}")
 
 @app.post("/api/password/unlock")
-def api_unlock_password(file: UploadFile = File(...), password: str = Form(...)):
-    in_path = _save_upload(file)
+async def api_unlock_password(file: UploadFile = File(...), password: str = Form(...)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"unlocked_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.unlock_pdf(in_path, out_path, password)
+        await run_in_threadpool(pdf_ops.unlock_pdf, in_path, out_path, password)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -259,40 +349,41 @@ def api_unlock_password(file: UploadFile = File(...), password: str = Form(...))
         raise HTTPException(status_code=500, detail=f"Unlock failed: {e}")
 
 @app.post("/api/header-footer")
-def api_header_footer(file: UploadFile = File(...), header: str = Form(""), footer: str = Form(""), font_size: int = Form(10)):
-    in_path = _save_upload(file)
+async def api_header_footer(file: UploadFile = File(...), header: str = Form(""), footer: str = Form(""), font_size: int = Form(10)):
+    in_path = await _save_upload(file)
     out_path = _outpath(f"hf_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.add_header_footer(in_path, out_path, header, footer, font_size)
+        await run_in_threadpool(pdf_ops.add_header_footer, in_path, out_path, header, footer, font_size)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Header/Footer failed: {e}")
 
 @app.post("/api/bookmarks/from-filenames")
-def api_bookmarks_from_filenames(files: List[UploadFile] = File(...)):
-    in_paths = [_save_upload(u) for u in files]
+async def api_bookmarks_from_filenames(files: List[UploadFile] = File(...)):
+    in_paths = [await _save_upload(u) for u in files]
     out_path = _outpath(f"bookmarked_merged_{uuid.uuid4().hex}.pdf")
     try:
-        pdf_ops.bookmarks_from_filenames(in_paths, out_path)
+        await run_in_threadpool(pdf_ops.bookmarks_from_filenames, in_paths, out_path)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Bookmarks/Merge failed: {e}")
 
 
 @app.post("/api/convert/pdf-to-docx")
-def api_pdf_to_docx(file: UploadFile = File(...),
-                    ocr: bool = Form(False),
-                    ocr_lang: str = Form(""),
-                    mode: str = Form("auto")):
+async def api_pdf_to_docx(file: UploadFile = File(...),
+                          ocr: bool = Form(False),
+                          ocr_lang: str = Form(""),
+                          mode: str = Form("auto")):
     """
     Convert a single PDF to DOCX using pdf2docx.
-    Optional OCR pre-pass (ocrmypdf) to improve text extraction.
+    Optional OCR pre-pass (tesseract) to improve text extraction.
     """
-    in_path = _save_upload(file)
+    in_path = await _save_upload(file)
     docx_name = f"docx_{uuid.uuid4().hex}.docx"
     out_path = _outpath(docx_name)
     try:
-        pdf_ops.pdf_to_docx(in_path, out_path, mode=mode, ocr_lang=(ocr_lang if ocr else ""))
+        with _cpu_pool() as pool:
+            await pdf_ops.pdf_to_docx(in_path, out_path, mode=mode, ocr_lang=(ocr_lang if ocr else ""), executor=pool)
         return {"file": f"/output/{os.path.basename(out_path)}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF→DOCX failed: {e}")
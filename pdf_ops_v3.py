@@ -1,13 +1,19 @@
+import asyncio
+import contextlib
 import os
 import io
-import shlex
+import re
 import subprocess
-from typing import List, Optional, Tuple
+import tempfile
+import uuid
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from itertools import islice
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 from PIL import Image
 import img2pdf
 import pikepdf
-from PyPDF2 import PdfReader, PdfWriter, PdfMerger, Transformation
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import mm
@@ -16,10 +22,36 @@ from pdfminer.high_level import extract_text_to_fp
 
 # ---- Helpers ----
 
-def run_cmd(cmd: str) -> Tuple[int, str, str]:
-    """Run shell command and return (code, out, err)."""
-    p = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    out, err = p.communicate()
+# asyncio semaphores bind to the loop that first waits on them, so they are kept per loop
+_LOOP_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
+
+def _loop_semaphore(name: str, value: int) -> asyncio.Semaphore:
+    sems = _LOOP_SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    if name not in sems:
+        sems[name] = asyncio.Semaphore(value)
+    return sems[name]
+
+def soffice_semaphore() -> asyncio.Semaphore:
+    """LibreOffice instances share one user profile and cannot run concurrently."""
+    return _loop_semaphore("soffice", 1)
+
+def ocr_semaphore() -> asyncio.Semaphore:
+    """Shared across requests so concurrent OCR jobs never run more tesseracts than cores."""
+    return _loop_semaphore("ocr", os.cpu_count() or 1)
+
+def cpu_semaphore() -> asyncio.Semaphore:
+    """Caps whole CPU-heavy jobs (OCR/compress/convert) at the core count; extra callers queue here."""
+    return _loop_semaphore("cpu", os.cpu_count() or 1)
+
+async def run_cmd_async(argv: List[str], env: Optional[dict] = None) -> Tuple[int, str, str]:
+    """Run a command without blocking the event loop and return (code, out, err)."""
+    p = await asyncio.create_subprocess_exec(*argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    try:
+        out, err = await p.communicate()
+    except asyncio.CancelledError:
+        p.kill()
+        await p.wait()
+        raise
     return p.returncode, out.decode('utf-8', 'ignore'), err.decode('utf-8', 'ignore')
 
 def save_bytes(path: str, data: bytes):
@@ -31,68 +63,174 @@ def ensure_pdf(path: str):
     if not path.lower().endswith(".pdf"):
         raise ValueError("Output must be a .pdf")
 
+def page_count(path: str) -> int:
+    with pikepdf.Pdf.open(path) as pdf:
+        return len(pdf.pages)
+
+def _open_all(paths: List[str]) -> List[pikepdf.Pdf]:
+    """Open several PDFs concurrently; qpdf does the parsing in C++. Caller closes them."""
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+        return list(pool.map(pikepdf.Pdf.open, paths))
+
+def _close_all(pdfs: List[pikepdf.Pdf]):
+    for pdf in pdfs:
+        pdf.close()
+
+def _page_chunks(n_pages: int, n_chunks: int, max_size: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Split 1..n_pages into n_chunks contiguous (first, last) ranges, or more if max_size caps their length."""
+    size = max(1, -(-n_pages // max(1, n_chunks)))
+    if max_size:
+        size = min(size, max_size)
+    return [(s, min(s + size - 1, n_pages)) for s in range(1, n_pages + 1, size)]
+
 # ---- Conversion ----
 
-def office_to_pdf(input_path: str, output_path: str) -> str:
+async def office_to_pdf(input_path: str, output_path: str) -> str:
     """Convert Office formats (docx/xlsx/pptx, etc.) to PDF using LibreOffice headless."""
     ensure_pdf(output_path)
     out_dir = os.path.dirname(output_path) or "."
-    cmd = f"soffice --headless --convert-to pdf --outdir {shlex.quote(out_dir)} {shlex.quote(input_path)}"
-    code, out, err = run_cmd(cmd)
-
-    # LibreOffice output file name is based on input file name
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
-    converted_path = os.path.join(out_dir, f"{base_name}.pdf")
-
-    if code != 0:
-        raise RuntimeError(f"LibreOffice conversion failed. Error: {err or out}")
-    if not os.path.exists(converted_path):
-        raise RuntimeError(f"LibreOffice succeeded but did not create expected file: {converted_path}")
-    
+    converted_path, = await office_files_to_pdf([input_path], out_dir)
     # Rename to desired output_path
     os.replace(converted_path, output_path)
     return output_path
 
-def images_to_pdf(input_paths: List[str], output_path: str) -> str:
-    """Convert a list of image files to a single PDF."""
+async def office_files_to_pdf(input_paths: List[str], output_dir: str) -> List[str]:
+    """
+    Convert several Office files with a single LibreOffice run (one startup instead of one per file).
+    Returns the PDF paths in input order. Input basenames must be unique.
+    """
+    if not input_paths:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    async with soffice_semaphore():
+        code, out, err = await run_cmd_async(["soffice", "--headless", "--convert-to", "pdf", "--outdir", output_dir, *input_paths])
+    if code != 0:
+        raise RuntimeError(f"LibreOffice conversion failed. Error: {err or out}")
+
+    # LibreOffice output file name is based on input file name
+    converted = [os.path.join(output_dir, f"{os.path.splitext(os.path.basename(p))[0]}.pdf") for p in input_paths]
+    for path in converted:
+        if not os.path.exists(path):
+            raise RuntimeError(f"LibreOffice succeeded but did not create expected file: {path}")
+    return converted
+
+def images_to_pdf(input_paths: List[str], output_path: Union[str, BinaryIO]) -> Union[str, BinaryIO]:
+    """Convert a list of image files to a single PDF (output may be a path or a binary file object)."""
+    data = img2pdf.convert(input_paths)
+    if not isinstance(output_path, str):
+        output_path.write(data)
+        return output_path
     ensure_pdf(output_path)
     with open(output_path, "wb") as f:
-        f.write(img2pdf.convert(input_paths))
+        f.write(data)
     return output_path
 
-def txt_to_pdf(input_path: str, output_path: str, pagesize: str = "A4") -> str:
-    """Convert a simple text file to PDF (auto page breaks)."""
-    ensure_pdf(output_path)
+def txt_to_pdf(input_path: str, output_path: Union[str, BinaryIO], pagesize: str = "A4") -> Union[str, BinaryIO]:
+    """Convert a simple text file to PDF (auto page breaks). Output may be a path or a binary file object."""
+    if isinstance(output_path, str):
+        ensure_pdf(output_path)
     size = A4 if pagesize.upper() == "A4" else letter
     c = canvas.Canvas(output_path, pagesize=size)
     width, height = size
     left = 20 * mm
     top = height - 20 * mm
     bottom = 20 * mm
-    text = c.beginText(left, top)
-    text.setFont("Helvetica", 10)
-    
+    font_size = 10
+    leading = 1.2 * font_size
+    lines_per_page = max(1, int((top - bottom) // leading))
+
+    pages = 0
     with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            if text.getY() <= bottom:
-                c.drawText(text)
-                c.showPage()
-                text = c.beginText(left, top)
-                text.setFont("Helvetica", 10)
-            text.textLine(line.rstrip("\n"))
-    
-    c.drawText(text)
+        # One text object per page, filled with a single textLines() call
+        while True:
+            chunk = [line.rstrip("\n") for line in islice(f, lines_per_page)]
+            if not chunk:
+                break
+            text = c.beginText(left, top)
+            text.setFont("Helvetica", font_size, leading)
+            text.textLines(chunk, trim=0)
+            c.drawText(text)
+            c.showPage()
+            pages += 1
+
+    if not pages:
+        c.showPage()  # empty input still yields one blank page
     c.save()
     return output_path
 
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".gif", ".tiff", ".bmp", ".webp")
+
+async def convert_to_pdf(input_paths: List[str], output_path: str,
+                         cpu_limit: Optional[asyncio.Semaphore] = None) -> str:
+    """
+    Convert a mix of Office documents, text files and images into one PDF.
+    Documents keep their order; images are combined into a final block.
+    Intermediate PDFs are kept in memory as pikepdf objects instead of temp files.
+    cpu_limit, if given, gates only the in-process rendering/merge step, not the
+    LibreOffice run (which is serialized by soffice_semaphore()).
+    """
+    ensure_pdf(output_path)
+    docs, images = [], []
+    for p in input_paths:
+        (images if os.path.splitext(p)[1].lower() in IMAGE_EXTS else docs).append(p)
+    if not docs and not images:
+        raise ValueError("No convertible files provided.")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # All Office documents go through one LibreOffice run
+        office = [p for p in docs if os.path.splitext(p)[1].lower() != ".txt"]
+        converted = dict(zip(office, await office_files_to_pdf(office, tmp_dir)))
+        async with cpu_limit or contextlib.nullcontext():
+            await asyncio.to_thread(_assemble_pdf, docs, images, converted, output_path)
+    return output_path
+
+def _assemble_pdf(docs: List[str], images: List[str], converted: dict, output_path: str):
+    """Render text/image inputs in memory and merge them with the converted Office PDFs."""
+    parts = []
+    try:
+        for p in docs:
+            if p in converted:
+                parts.append(pikepdf.Pdf.open(converted[p]))
+            else:
+                buf = io.BytesIO()
+                txt_to_pdf(p, buf)
+                parts.append(pikepdf.Pdf.open(buf))
+        if images:
+            buf = io.BytesIO()
+            images_to_pdf(images, buf)
+            parts.append(pikepdf.Pdf.open(buf))
+        merge_pdfs_in_memory(parts, output_path)
+    finally:
+        _close_all(parts)
+
 # ---- PDF Export ----
 
+RENDER_CHUNK_PAGES = 8
+
 def pdf_to_images(input_path: str, output_dir: str, dpi: int = 200, fmt: str = "png") -> List[str]:
-    """Convert PDF pages to image files using pdf2image (requires Poppler)."""
+    """Convert PDF pages to image files using pdf2image (requires Poppler).
+
+    pdftoppm is single-threaded, so the page range is split into chunks of at most
+    RENDER_CHUNK_PAGES pages, rendered by up to one pdftoppm process per CPU. Small
+    chunks keep each process's peak memory bounded regardless of document size.
+    """
     os.makedirs(output_dir, exist_ok=True)
-    # paths_only=True returns filesystem paths instead of PIL images
-    images = convert_from_path(input_path, dpi=dpi, fmt=fmt, output_folder=output_dir, paths_only=True)
-    return list(images)
+    workers = os.cpu_count() or 1
+    chunks = _page_chunks(page_count(input_path), workers, max_size=RENDER_CHUNK_PAGES)
+    if not chunks:
+        return []
+
+    def render(chunk: Tuple[int, int]) -> List[str]:
+        first, last = chunk
+        # paths_only=True returns filesystem paths instead of PIL images
+        return convert_from_path(input_path, dpi=dpi, fmt=fmt, output_folder=output_dir, paths_only=True,
+                                 first_page=first, last_page=last, thread_count=1)
+
+    # Threads are enough here: the rendering happens in the pdftoppm subprocesses
+    with ThreadPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        return [path for paths in pool.map(render, chunks) for path in paths]
 
 def extract_text(input_path: str, output_path: str) -> str:
     """Extract layout-free text from PDF to a TXT file."""
@@ -105,128 +243,192 @@ def extract_text(input_path: str, output_path: str) -> str:
 
 def merge_pdfs(input_paths: List[str], output_path: str) -> str:
     """Merge a list of PDF files into a single PDF."""
+    parts = _open_all(input_paths)
+    try:
+        return merge_pdfs_in_memory(parts, output_path)
+    finally:
+        _close_all(parts)
+
+def merge_pdfs_in_memory(pdfs: List[pikepdf.Pdf], output_path: str) -> str:
+    """Merge already-open PDFs into a single PDF (the caller keeps them open until this returns)."""
     ensure_pdf(output_path)
-    merger = PdfMerger()
-    for path in input_paths:
-        merger.append(path)
-    with open(output_path, "wb") as f:
-        merger.write(f)
-    merger.close()
+    pdf = pikepdf.Pdf.new()
+    for part in pdfs:
+        pdf.pages.extend(part.pages)
+    pdf.save(output_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
     return output_path
 
-def _parse_ranges(ranges_str: str, num_pages: int) -> List[List[int]]:
-    """Parse '1-3,5,9-12' into 1-based page lists limited by num_pages."""
+_RANGE_RE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+))?\s*")
+
+def _parse_ranges(ranges_str: str, num_pages: int) -> List[Tuple[int, int]]:
+    """Parse '1-3,5,9-12' into 1-based inclusive (start, end) tuples limited by num_pages."""
     output = []
-    parts = [p.strip() for p in ranges_str.replace(";", ",").split(",") if p.strip()]
-    for part in parts:
-        if "-" in part:
-            a, b = part.split("-", 1)
-            try:
-                start = max(1, int(a))
-                end = min(int(b), num_pages)
-                if start <= end:
-                    output.append(list(range(start, end + 1)))
-            except ValueError:
-                continue
-        else:
-            try:
-                p = int(part)
-                if 1 <= p <= num_pages:
-                    output.append([p])
-            except ValueError:
-                continue
+    for part in ranges_str.replace(";", ",").split(","):
+        m = _RANGE_RE.fullmatch(part)
+        if not m:
+            continue  # malformed tokens ('3-', '2.5', '1 2', ...) are skipped, blanks too
+        start = int(m.group(1))
+        end = int(m.group(2)) if m.group(2) else start
+        start, end = max(1, start), min(end, num_pages)
+        if start <= end:
+            output.append((start, end))
     return output
 
 def split_pdf(input_path: str, output_dir: str, ranges: str) -> List[str]:
     """Split a PDF by page ranges (e.g., '1-3,5,9-12')."""
     os.makedirs(output_dir, exist_ok=True)
-    reader = PdfReader(input_path)
     files = []
-    page_sets = _parse_ranges(ranges, len(reader.pages))
-    
-    for i, page_set in enumerate(page_sets):
-        writer = PdfWriter()
-        for page_num in page_set:
-            writer.add_page(reader.pages[page_num - 1])
-        out_path = os.path.join(output_dir, f"split_{i+1}.pdf")
-        with open(out_path, "wb") as f:
-            writer.write(f)
-        files.append(out_path)
+    # Parts are serialized in memory here and written to disk by a small writer pool,
+    # so file writes overlap with building the next part.
+    with pikepdf.Pdf.open(input_path) as pdf, ThreadPoolExecutor(max_workers=4) as writers:
+        page_ranges = _parse_ranges(ranges, len(pdf.pages))
+        pending = []
+        for i, (start, end) in enumerate(page_ranges):
+            part = pikepdf.Pdf.new()
+            part.pages.extend(pdf.pages[start - 1:end])
+            buf = io.BytesIO()
+            part.save(buf)
+            out_path = os.path.join(output_dir, f"split_{i+1}.pdf")
+            pending.append(writers.submit(save_bytes, out_path, buf.getvalue()))
+            files.append(out_path)
+        for fut in pending:
+            fut.result()  # surface write errors
     return files
 
 def rotate_pdf(input_path: str, output_path: str, rotation: int = 90) -> str:
     """Rotate all pages in a PDF (degrees: 90/180/270)."""
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-    for page in reader.pages:
-        page.rotate(rotation)
-        writer.add_page(page)
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    with pikepdf.Pdf.open(input_path) as pdf:
+        for page in pdf.pages:
+            page.rotate(rotation, relative=True)
+        pdf.save(output_path)
     return output_path
 
 def reorder_pdf(input_path: str, output_path: str, order: List[int]) -> str:
     """Reorder pages based on a 0-indexed list of page indices."""
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-    for index in order:
-        if 0 <= index < len(reader.pages):
-            writer.add_page(reader.pages[index])
-        else:
-            raise ValueError(f"Invalid index in order: {index}")
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    with pikepdf.Pdf.open(input_path) as pdf:
+        pages = list(pdf.pages)
+        n = len(pages)
+        for index in order:
+            if not 0 <= index < n:
+                raise ValueError(f"Invalid index in order: {index}")
+        with _rebuild_with_pages(pdf, [pages[index] for index in order]) as out:
+            out.save(output_path)
     return output_path
 
 def delete_pages(input_path: str, output_path: str, indices: List[int]) -> str:
     """Delete pages based on a 0-indexed list of page indices."""
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-    to_delete = set(i for i in indices if 0 <= i < len(reader.pages))
-    for i, page in enumerate(reader.pages):
-        if i not in to_delete:
-            writer.add_page(page)
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    with pikepdf.Pdf.open(input_path) as pdf:
+        dropped = set(indices)
+        kept = [page for i, page in enumerate(pdf.pages) if i not in dropped]
+        with _rebuild_with_pages(pdf, kept) as out:
+            out.save(output_path)
     return output_path
 
+# Document-level catalog entries carried over when pages are rebuilt into a new Pdf.
+# /PageLabels and /StructTreeRoot are left out: both are keyed to the old page order.
+_CARRIED_ROOT_KEYS = ("/Outlines", "/Dests", "/Names", "/Metadata", "/AcroForm", "/OCProperties",
+                      "/ViewerPreferences", "/PageMode", "/PageLayout", "/Lang", "/MarkInfo")
+
+def _copy_foreign(out: pikepdf.Pdf, src: pikepdf.Pdf, obj):
+    """Copy obj from src into out (copy_foreign only accepts indirect objects)."""
+    if isinstance(obj, (pikepdf.Dictionary, pikepdf.Array, pikepdf.Stream)):
+        if not obj.is_indirect:
+            obj = src.make_indirect(obj)
+        return out.copy_foreign(obj)
+    return obj
+
+def _rebuild_with_pages(pdf: pikepdf.Pdf, pages: List[pikepdf.Page]) -> pikepdf.Pdf:
+    """New Pdf holding pages in the given order plus pdf's bookmarks and metadata.
+
+    Appending to an empty Pdf is linear, whereas removing or moving pages in place
+    costs O(n) each in qpdf. Pages and bookmark targets go through the same foreign
+    copy map, so bookmarks still resolve; repeated pages are shallow copies. pdf must
+    stay open until the result is saved.
+    """
+    out = pikepdf.Pdf.new()
+    out.pages.extend(pages)
+    for key in _CARRIED_ROOT_KEYS:
+        if key in pdf.Root:
+            out.Root[key] = _copy_foreign(out, pdf, pdf.Root[key])
+    if "/Info" in pdf.trailer:
+        out.trailer.Info = _copy_foreign(out, pdf, pdf.trailer.Info)
+    _prune_outlines(out)
+    return out
+
+def _outline_target(item: pikepdf.OutlineItem) -> Optional[pikepdf.Object]:
+    """Page dictionary an outline item jumps to, if it uses an explicit destination."""
+    dest = item.destination
+    if dest is None and item.action is not None and item.action.get("/S") == pikepdf.Name.GoTo:
+        dest = item.action.get("/D")
+    if isinstance(dest, pikepdf.Array) and len(dest) and isinstance(dest[0], pikepdf.Dictionary):
+        return dest[0]
+    return None
+
+def _prune_outlines(pdf: pikepdf.Pdf):
+    """Drop bookmarks whose destination page is no longer in the page tree (their children move up)."""
+    if "/Outlines" not in pdf.Root:
+        return
+    live = {page.objgen for page in pdf.pages}
+
+    def prune(items: List[pikepdf.OutlineItem]) -> List[pikepdf.OutlineItem]:
+        kept = []
+        for item in items:
+            item.children[:] = prune(item.children)
+            target = _outline_target(item)
+            if target is not None and target.objgen not in live:
+                kept.extend(item.children)
+            else:
+                kept.append(item)
+        return kept
+
+    with pdf.open_outline() as outline:
+        outline.root[:] = prune(outline.root)
+
 # ---- Layout (NEW IN V3) ----
 
-def _page_size(reader: PdfReader):
-    p = reader.pages[0]
-    return float(p.mediabox.width), float(p.mediabox.height)
+def _page_size(pdf: pikepdf.Pdf):
+    box = pikepdf.Rectangle(pdf.pages[0].mediabox)
+    return box.width, box.height
+
+def _impose(out: pikepdf.Pdf, sheet: pikepdf.Page, placements: List[Tuple[pikepdf.Page, pikepdf.Rectangle]]):
+    """
+    Draw source pages onto a sheet of `out`, each fitted into its rectangle (aspect preserved).
+    Every page is copied in as a Form XObject (resources shared between source pages are
+    copied once), and the sheet gets one content stream of `q cm /Fx Do Q` sequences.
+    """
+    ops = []
+    for page, rect in placements:
+        formx = out.copy_foreign(page.as_form_xobject())
+        name = sheet.add_resource(formx, pikepdf.Name.XObject, prefix="Fx")
+        ops.append(sheet.calc_form_xobject_placement(formx, name, rect, allow_shrink=True, allow_expand=True))
+    sheet.contents_add(pikepdf.Stream(out, b"".join(ops)))
 
 def n_up_pdf(input_path: str, output_path: str, cols: int = 2, rows: int = 2, margin_mm: float = 5.0) -> str:
     """Place multiple source pages on a single sheet (N-up)."""
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-    W, H = _page_size(reader)
-    margin = margin_mm * mm
-    cell_w = (W - 2*margin) / cols
-    cell_h = (H - 2*margin) / rows
-
-    sheet = None
-    cell_idx = 0
-    for page in reader.pages:
-        if sheet is None or cell_idx >= cols*rows:
-            sheet = writer.add_blank_page(width=W, height=H)
-            cell_idx = 0
-        r = cell_idx // cols
-        c = cell_idx % cols
-        x = margin + c * cell_w
-        y = H - margin - (r+1) * cell_h  # top-down
-        pw = float(page.mediabox.width); ph = float(page.mediabox.height)
-        scale = min(cell_w/pw, cell_h/ph)
-        tx = Transformation().scale(scale).translate(x, y)
-        sheet.merge_transformed_page(page, tx)
-        cell_idx += 1
-
-    with open(output_path, "wb") as f:
-        writer.write(f)
+    with pikepdf.Pdf.open(input_path) as pdf, pikepdf.Pdf.new() as out:
+        src_pages = list(pdf.pages)
+        W, H = _page_size(pdf)
+        margin = margin_mm * mm
+        cell_w = (W - 2*margin) / cols
+        cell_h = (H - 2*margin) / rows
+
+        per_sheet = cols*rows
+        for first in range(0, len(src_pages), per_sheet):
+            sheet = out.add_blank_page(page_size=(W, H))
+            placements = []
+            for cell_idx, page in enumerate(src_pages[first:first + per_sheet]):
+                r = cell_idx // cols
+                c = cell_idx % cols
+                x = margin + c * cell_w
+                y = H - margin - (r+1) * cell_h  # top-down
+                placements.append((page, pikepdf.Rectangle(x, y, x + cell_w, y + cell_h)))
+            _impose(out, sheet, placements)
+
+        out.save(output_path)
     return output_path
 
 def booklet_impose(input_path: str, output_path: str, margin_mm: float = 5.0) -> str:
@@ -235,58 +437,58 @@ def booklet_impose(input_path: str, output_path: str, margin_mm: float = 5.0) ->
     Pads to multiple of 4 pages. Produces sheets with two pages side-by-side.
     """
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    n = len(reader.pages)
-    pad = (4 - (n % 4)) % 4
-    pages = list(range(n)) + [-1]*pad  # -1 means blank
-    left = 0
-    right = len(pages) - 1
-    order = []
-    while left < right:
-        order.extend([pages[right], pages[left]])  # Back sheet
-        left += 1; right -= 1
-        if left < right:
-            order.extend([pages[left], pages[right]])  # Front sheet
+    with pikepdf.Pdf.open(input_path) as pdf, pikepdf.Pdf.new() as out:
+        src_pages = list(pdf.pages)
+        n = len(src_pages)
+        pad = (4 - (n % 4)) % 4
+        pages = list(range(n)) + [-1]*pad  # -1 means blank
+        left = 0
+        right = len(pages) - 1
+        order = []
+        while left < right:
+            order.extend([pages[right], pages[left]])  # Back sheet
             left += 1; right -= 1
-
-    W, H = _page_size(reader)
-    sheet_w, sheet_h = H*2, W  # landscape with two portrait pages side by side
-    margin = margin_mm * mm
-    cell_w = (sheet_w - 3*margin)/2
-    cell_h = sheet_h - 2*margin
-
-    writer = PdfWriter()
-    for i in range(0, len(order), 2):
-        sheet = writer.add_blank_page(width=sheet_w, height=sheet_h)
-        for j in range(2):
-            idx = order[i+j] if i+j < len(order) else -1
-            if idx == -1:
-                continue
-            page = reader.pages[idx]
-            pw, ph = float(page.mediabox.width), float(page.mediabox.height)
-            scale = min(cell_w/pw, cell_h/ph)
-            x = margin if j == 0 else margin*2 + cell_w
-            y = (sheet_h - cell_h)/2
-            tx = Transformation().scale(scale).translate(x, y)
-            sheet.merge_transformed_page(page, tx)
-    with open(output_path, "wb") as f:
-        writer.write(f)
+            if left < right:
+                order.extend([pages[left], pages[right]])  # Front sheet
+                left += 1; right -= 1
+
+        W, H = _page_size(pdf)
+        sheet_w, sheet_h = H*2, W  # landscape with two portrait pages side by side
+        margin = margin_mm * mm
+        cell_w = (sheet_w - 3*margin)/2
+        cell_h = sheet_h - 2*margin
+
+        for i in range(0, len(order), 2):
+            sheet = out.add_blank_page(page_size=(sheet_w, sheet_h))
+            placements = []
+            for j in range(2):
+                idx = order[i+j] if i+j < len(order) else -1
+                if idx == -1:
+                    continue
+                x = margin if j == 0 else margin*2 + cell_w
+                y = (sheet_h - cell_h)/2
+                placements.append((src_pages[idx], pikepdf.Rectangle(x, y, x + cell_w, y + cell_h)))
+            _impose(out, sheet, placements)
+
+        out.save(output_path)
     return output_path
 
 def merge_alternating(input_a: str, input_b: str, output_path: str) -> str:
     """Interleave pages from two PDFs: A1, B1, A2, B2, ... (append remaining)."""
     ensure_pdf(output_path)
-    ra = PdfReader(input_a)
-    rb = PdfReader(input_b)
-    wa = len(ra.pages); wb = len(rb.pages)
-    w = PdfWriter()
-    for i in range(max(wa, wb)):
-        if i < wa:
-            w.add_page(ra.pages[i])
-        if i < wb:
-            w.add_page(rb.pages[i])
-    with open(output_path, "wb") as f:
-        w.write(f)
+    parts = _open_all([input_a, input_b])
+    try:
+        pa, pb = (list(part.pages) for part in parts)
+        wa = len(pa); wb = len(pb)
+        pdf = pikepdf.Pdf.new()
+        for i in range(max(wa, wb)):
+            if i < wa:
+                pdf.pages.append(pa[i])
+            if i < wb:
+                pdf.pages.append(pb[i])
+        pdf.save(output_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    finally:
+        _close_all(parts)
     return output_path
 
 # ---- Security ----
@@ -329,114 +531,205 @@ def unlock_pdf(input_path: str, output_path: str, password: str) -> str:
 def add_header_footer(input_path: str, output_path: str, header: str = "", footer: str = "", font_size: int = 10) -> str:
     """Add simple header and footer text to each page (auto-sizes overlay to page)."""
     ensure_pdf(output_path)
-    reader = PdfReader(input_path)
-    writer = PdfWriter()
-
-    for i, page in enumerate(reader.pages, start=1):
+    with pikepdf.Pdf.open(input_path) as pdf:
+        # Draw every page's header/footer into one overlay document, sized page by page
         packet = io.BytesIO()
-        w = float(page.mediabox.width)
-        h = float(page.mediabox.height)
-        c = canvas.Canvas(packet, pagesize=(w, h))
-        c.setFont("Helvetica", font_size)
-        if header:
-            c.drawString(10*mm, h - 10*mm, header.replace("{page}", str(i)))
-        if footer:
-            c.drawRightString(w - 10*mm, 10*mm, footer.replace("{page}", str(i)))
+        c = canvas.Canvas(packet)
+        for i, page in enumerate(pdf.pages, start=1):
+            box = pikepdf.Rectangle(page.mediabox)
+            w, h = box.width, box.height
+            c.setPageSize((w, h))
+            c.setFont("Helvetica", font_size)
+            if header:
+                c.drawString(10*mm, h - 10*mm, header.replace("{page}", str(i)))
+            if footer:
+                c.drawRightString(w - 10*mm, 10*mm, footer.replace("{page}", str(i)))
+            c.showPage()
         c.save()
         packet.seek(0)
-        overlay_reader = PdfReader(packet)
-        overlay_page = overlay_reader.pages[0]
-        page.merge_page(overlay_page)
-        writer.add_page(page)
 
-    with open(output_path, "wb") as f:
-        writer.write(f)
+        # Foreign objects are read at save time, so the overlay stays open until then
+        with pikepdf.Pdf.open(packet) as overlay:
+            for page, overlay_page in zip(pdf.pages, overlay.pages):
+                page.add_overlay(pdf.copy_foreign(overlay_page.as_form_xobject()))
+            pdf.save(output_path)
     return output_path
 
 # ---- Optimization ----
 
-def ocr_pdf(input_path: str, output_path: str, lang: str = "eng") -> str:
-    """Perform OCR on a PDF using ocrmypdf (relies on Tesseract)."""
+async def ocr_pdf(input_path: str, output_path: str, lang: str = "eng", engine: str = "tesseract", dpi: int = 300) -> str:
+    """
+    Perform OCR on a PDF.
+    - engine="tesseract" (default): render and OCR every page in parallel (pdftocairo + tesseract),
+      then overlay each page's invisible text layer onto the original page.
+    - engine="ocrmypdf": single ocrmypdf run (PDF/A output) using all cores via --jobs.
+    """
     ensure_pdf(output_path)
-    cmd = f"ocrmypdf -l {shlex.quote(lang)} --output-type pdfa --optimize 0 --clean {shlex.quote(input_path)} {shlex.quote(output_path)}"
-    code, out, err = run_cmd(cmd)
-    if code != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
-        raise RuntimeError(f"OCR failed. Error: {err or out}")
+    if engine == "ocrmypdf":
+        jobs = os.cpu_count() or 1
+        code, out, err = await run_cmd_async(["ocrmypdf", "-l", lang, "--jobs", str(jobs), "--output-type", "pdfa",
+                                              input_path, output_path])
+        if code != 0 or not os.path.exists(output_path) or os.path.getsize(output_path) == 0:
+            raise RuntimeError(f"OCR failed. Error: {err or out}")
+        return output_path
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        n_pages = await asyncio.to_thread(page_count, input_path)
+
+        async def ocr_page(page_no: int) -> str:
+            async with ocr_semaphore():
+                return await _ocr_page(input_path, page_no, tmp_dir, lang, dpi)
+
+        # TaskGroup cancels (and kills) the remaining pages if one fails
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(ocr_page(n)) for n in range(1, n_pages + 1)]
+        except ExceptionGroup as eg:
+            raise eg.exceptions[0]
+        await asyncio.to_thread(_overlay_text_layers, input_path, [t.result() for t in tasks], output_path)
     return output_path
 
-def compress_pdf(input_path: str, output_path: str, dpi: int = 150, grayscale: bool = False) -> str:
-    """Simple compression by rasterizing pages to images and back. For better results use Ghostscript."""
+async def _ocr_page(input_path: str, page_no: int, tmp_dir: str, lang: str, dpi: int) -> str:
+    """Render one page and OCR it into a text-only PDF; returns the PDF path."""
+    base = os.path.join(tmp_dir, f"p{page_no}")
+    code, out, err = await run_cmd_async(["pdftocairo", "-png", "-r", str(dpi), "-singlefile",
+                                          "-f", str(page_no), "-l", str(page_no), input_path, base])
+    if code != 0:
+        raise RuntimeError(f"Rendering page {page_no} failed. Error: {err or out}")
+    # One tesseract per core already; keep each one single-threaded
+    env = dict(os.environ, OMP_THREAD_LIMIT="1")
+    code, out, err = await run_cmd_async(["tesseract", base + ".png", base, "-l", lang, "--dpi", str(dpi),
+                                          "-c", "textonly_pdf=1", "pdf"], env=env)
+    if code != 0 or not os.path.exists(base + ".pdf"):
+        raise RuntimeError(f"OCR failed on page {page_no}. Error: {err or out}")
+    os.remove(base + ".png")
+    return base + ".pdf"
+
+def _overlay_text_layers(input_path: str, layer_paths: List[str], output_path: str):
+    """Overlay each one-page text layer PDF onto the matching page of input_path."""
+    layers = _open_all(layer_paths)
+    try:
+        with pikepdf.Pdf.open(input_path) as pdf:
+            for page, layer in zip(pdf.pages, layers):
+                page.add_overlay(pdf.copy_foreign(layer.pages[0].as_form_xobject()))
+            pdf.save(output_path)
+    finally:
+        _close_all(layers)
+
+def compress_pdf(input_path: str, output_path: str, dpi: int = 150, grayscale: bool = False, quality: int = 75) -> str:
+    """
+    Compress a PDF in place with pikepdf: raster images larger than `dpi` at full-page size
+    are downsampled and re-encoded as JPEG, and the file is rewritten with object streams.
+    Text and vector content are left untouched.
+    """
     ensure_pdf(output_path)
-    tmp_dir = os.path.join(os.path.dirname(output_path), "_compress_tmp")
-    os.makedirs(tmp_dir, exist_ok=True)
-    # Render pages
-    imgs = pdf_to_images(input_path, tmp_dir, dpi=dpi, fmt="jpeg")
-    # Convert back to PDF
-    kwargs = {}
-    if grayscale:
-        # img2pdf uses ColorSpace enum in newer versions
-        try:
-            kwargs["colorspace"] = img2pdf.ColorSpace.GRAY
-        except Exception:
-            pass
-    with open(output_path, "wb") as f:
-        f.write(img2pdf.convert(imgs, **kwargs))
-    # Cleanup
-    for path in imgs:
-        try:
-            os.remove(path)
-        except Exception:
-            pass
+    with pikepdf.Pdf.open(input_path) as pdf:
+        seen = set()
+        for page in pdf.pages:
+            box = pikepdf.Rectangle(page.mediabox)
+            max_w = max(1, int(box.width / 72 * dpi))
+            max_h = max(1, int(box.height / 72 * dpi))
+            for _, raw in page.images.items():
+                if raw.objgen in seen:
+                    continue
+                seen.add(raw.objgen)
+                _recompress_image(raw, max_w, max_h, grayscale, quality)
+        pdf.save(output_path,
+                 object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                 compress_streams=True,
+                 linearize=True)
+    return output_path
+
+def _recompress_image(raw: pikepdf.Stream, max_w: int, max_h: int, grayscale: bool, quality: int):
+    """Downsample/re-encode one image XObject as JPEG if that makes it smaller."""
+    if raw.get("/ImageMask", False) or int(raw.get("/BitsPerComponent", 8)) < 8:
+        return  # stencil masks and bilevel scans compress better than JPEG already
+    decode = raw.get("/Decode")
+    if decode is not None and [float(v) for v in decode] != [0.0, 1.0] * (len(decode) // 2):
+        return  # as_pil_image() ignores /Decode, so a re-encode would e.g. invert the image
+    if isinstance(raw.get("/Mask"), pikepdf.Array):
+        return  # colour-key masks need exact sample values, which JPEG does not keep
     try:
-        os.rmdir(tmp_dir)
+        img = pikepdf.PdfImage(raw).as_pil_image()
     except Exception:
-        pass
-    return output_path
+        return  # unsupported filter/colorspace: keep the original stream
+    is_gray = img.mode in ("1", "L", "LA")
+    to_gray = grayscale and not is_gray  # the one case that must re-encode even if it grows
+    scale = min(1.0, max_w / img.width, max_h / img.height)
+    if scale >= 1.0 and not to_gray:
+        return
+    if scale < 1.0:
+        img = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.LANCZOS)
+    img = img.convert("L" if grayscale or is_gray else "RGB")
+
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality, optimize=True)
+    data = buf.getvalue()
+    if not to_gray and len(data) >= len(raw.read_raw_bytes()):
+        return
+    raw.write(data, filter=pikepdf.Name.DCTDecode)
+    raw.Width, raw.Height = img.width, img.height
+    raw.ColorSpace = pikepdf.Name.DeviceGray if img.mode == "L" else pikepdf.Name.DeviceRGB
+    raw.BitsPerComponent = 8
+    for key in ("/DecodeParms", "/Decode"):  # /Decode, if present, is the default
+        if key in raw:
+            del raw[key]
 
 # ---- Bookmarks (basic) ----
 
 def bookmarks_from_filenames(input_paths: List[str], output_path: str) -> str:
     """Merge PDFs and create bookmarks using each file's basename as a top-level outline."""
     ensure_pdf(output_path)
-    pdf = pikepdf.Pdf.new()
-    outline = pdf.open_outline()
-    for p in input_paths:
-        with pikepdf.Pdf.open(p) as part:
-            start = len(pdf.pages)
-            pdf.pages.extend(part.pages)
-            title = os.path.splitext(os.path.basename(p))[0]
-            # OutlineItem works across pikepdf versions
-            try:
-                item = pikepdf.OutlineItem(title=title, page_number=start)
-                outline.root.append(item)
-            except Exception:
-                # Fallback older API
-                outline.root.append((title, start))
-    pdf.save(output_path)
+    parts = _open_all(input_paths)
+    try:
+        pdf = pikepdf.Pdf.new()
+        with pdf.open_outline() as outline:
+            for p, part in zip(input_paths, parts):
+                start = len(pdf.pages)
+                pdf.pages.extend(part.pages)
+                title = os.path.splitext(os.path.basename(p))[0]
+                # An int destination is a 0-based page index
+                outline.root.append(pikepdf.OutlineItem(title, start))
+        pdf.save(output_path, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    finally:
+        _close_all(parts)
     return output_path
 
 
 from pdf2docx import Converter as PDF2DOCXConverter
 
-def pdf_to_docx(input_path: str, output_path: str, mode: str = "auto", ocr_lang: str = "") -> str:
+async def pdf_to_docx(input_path: str, output_path: str, mode: str = "auto", ocr_lang: str = "",
+                      executor: Optional[Executor] = None) -> str:
     """
     Convert PDF to DOCX using pdf2docx.
     - mode: "auto" (default), "lines", "paragraph", "table" (pdf2docx layout strategies)
-    - ocr_lang: if provided, run an OCR pre-pass (ocrmypdf) to improve text layers before conversion.
+    - ocr_lang: if provided, run an OCR pre-pass (ocr_pdf) to improve text layers before conversion.
+    - executor: where the (CPU-bound) pdf2docx conversion runs; defaults to the loop's thread pool.
     """
     ensure_pdf(input_path) if input_path.lower().endswith(".pdf") else None
 
     # Optional OCR pre-pass to enhance text extraction on scanned PDFs
     temp_pdf = None
     if ocr_lang:
-        import uuid, shlex
         temp_pdf = os.path.join(os.path.dirname(output_path), f"_ocr_{uuid.uuid4().hex}.pdf")
-        code, out, err = run_cmd(f"ocrmypdf -l {shlex.quote(ocr_lang)} --optimize 0 --clean {shlex.quote(input_path)} {shlex.quote(temp_pdf)}")
-        if code != 0 or not os.path.exists(temp_pdf):
+        try:
+            await ocr_pdf(input_path, temp_pdf, lang=ocr_lang)
+        except Exception:
             # If OCR fails, fall back to original PDF
             temp_pdf = None
 
     src = temp_pdf or input_path
+    try:
+        await asyncio.get_running_loop().run_in_executor(executor, _pdf2docx_convert, src, output_path)
+    finally:
+        # Cleanup temp
+        if temp_pdf and os.path.exists(temp_pdf):
+            try: os.remove(temp_pdf)
+            except: pass
+
+    return output_path
+
+def _pdf2docx_convert(src: str, output_path: str):
     # pdf2docx supports page range and layout mode; we'll pass mode via parse.
     # For complex docs, "auto" is usually best; tables-heavy docs may try "table".
     cvt = PDF2DOCXConverter(src)
@@ -446,10 +739,3 @@ def pdf_to_docx(input_path: str, output_path: str, mode: str = "auto", ocr_lang:
         cvt.convert(output_path)  # whole document
     finally:
         cvt.close()
-
-    # Cleanup temp
-    if temp_pdf and os.path.exists(temp_pdf):
-        try: os.remove(temp_pdf)
-        except: pass
-
-    return output_path